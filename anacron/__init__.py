@@ -8,7 +8,7 @@ from .decorators import (
     cron,
     delay,
 )
-from .engine import engine as _engine
+from .engine import get_engine as _get_engine
 
 
 __all__ = ["cron", "delay", "django_autostart", "start"]
@@ -20,13 +20,19 @@ def start(database_file=None):
     Call this from the framework of choice to explicitly
     activate anacron.
     """
-    _engine.start(database_file=database_file)
+    _get_engine().start(database_file=database_file)
 
 
 def django_autostart(database_file=None):
     """
     Start anacron on a django-application depending on the
     debug-settings. If debug is True, anacron will not start.
+    Call this from the `ready()` method of an AppConfig:
+
+        class MyAppConfig(AppConfig):
+            def ready(self):
+                anacron.django_autostart()
+
     """
     debug = configuration.configuration.get_django_debug_setting()
     if not debug:
@@ -4,11 +4,13 @@ admin.py
 Administration tool to access the database.
 """
 
-import argparse
+import os
+import pathlib
 
 from .sql_interface import (
     interface,
     MAX_WORKERS_DEFAULT,
+    SQLiteInterface,
 )
 
 
@@ -28,18 +30,12 @@ def _format_item_list(data, separator="\n", divider=":", column_width=None):
     (the colons in the exaple data given above) are vertical aligned.
     Returns the new formatted string.
     """
-    keys = []
-    values = []
-    for line in data.split(separator):
-        key, value = line.split(divider, 1)
-        keys.append(key)
-        values.append(value)
+    pairs = [line.split(divider, 1) for line in data.split(separator)]
     if column_width is None:
-        # here is pylint wrong:
-        # pylint: disable=unnecessary-lambda
-        column_width = len(max(keys, key=lambda x: len(x)))
-    template = f"{{:{column_width}}}{divider} {{}}"
-    return separator.join(template.format(k, v) for k, v in zip(keys, values))
+        column_width = max(len(key) for key, _ in pairs)
+    return separator.join(
+        f"{key.ljust(column_width)}{divider} {value}" for key, value in pairs
+    )
 
 
 def report_info():
@@ -58,13 +54,15 @@ def _report_tasks(tasks, task_type="tasks"):
     Helperfunction: takes a list of Hybridnamespace intstances and print
     them nicely formated to stdout.
     """
-    print(f"\n{task_type} found: {len(tasks)}")
     divider = "-" * 50
+    lines = [f"\n{task_type} found: {len(tasks)}"]
     for task in tasks:
-        task = _format_item_list(str(task))
-        print(f"{divider}\n{task}")
-    print(divider)
-    print()
+        lines.append(divider)
+        lines.append(_format_item_list(str(task)))
+    lines.append(divider)
+    lines.append("")
+    # a single write for all tasks:
+    print("\n".join(lines))
 
 
 def report_tasks():
@@ -74,7 +72,7 @@ def report_tasks():
 
 def report_tasks_on_due():
     """Report all tasks waiting for execution and are on due."""
-    _report_tasks(interface.get_tasks_on_due())
+    _report_tasks(interface.get_tasks_on_due(limit=-1))
 
 
 def report_cron_tasks():
@@ -108,6 +106,17 @@ def set_max_workers(workers):
     print(f"Set max_workers to {workers}")
 
 
+def _unlink_database(db_name, main_file=True):
+    """
+    Helperfunction: deletes the database file `db_name` (a pathlib.Path)
+    together with the according "-wal" and "-shm" files if existing.
+    With `main_file` set to False the database file itself is kept.
+    """
+    suffixes = ("", "-wal", "-shm") if main_file else ("-wal", "-shm")
+    for suffix in suffixes:
+        db_name.with_name(f"{db_name.name}{suffix}").unlink(missing_ok=True)
+
+
 def delete_database():
     """
     Delete the database and create the database again with the default
@@ -115,66 +124,76 @@ def delete_database():
     """
     answer = input("Sure to delete the current database? [y/n]: ")
     if answer.lower() == 'y':
-        interface.db_name.unlink()
-        # this could be all, because at the next anacron import
-        # a new database will get created.
-        # However, create a new database here and now:
-        # pylint: disable=protected-access
-        interface._init_database()
+        # create a new database beside the current one and replace the
+        # current one atomically, so the database file exists all the
+        # time:
+        db_name = pathlib.Path(interface.db_name)
+        new_db_name = db_name.with_name(f"{db_name.name}.new")
+        # remove leftovers of a former aborted run:
+        _unlink_database(new_db_name)
+        SQLiteInterface(db_name=new_db_name).close()
+        # reconnect to the new database on next access:
+        interface.close()
+        _unlink_database(db_name, main_file=False)
+        os.replace(new_db_name, db_name)
     else:
         print("abort command")
 
 
 def get_command_line_arguments():
     """Get the command line arguments."""
+    # import here to keep `import anacron.admin` fast:
+    import argparse  # pylint: disable=import-outside-toplevel
     parser = argparse.ArgumentParser(
         prog=PGM_NAME,
         description=PGM_DESCRIPTION,
     )
-    parser.add_argument(
+    # the commands are exclusive: one command per call
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
         "-i", "--info",
         action="store_true",
         help="provide information about the settings, number of waiting tasks "\
              "and result entries."
     )
-    parser.add_argument(
+    group.add_argument(
         "--reset-defaults",
         dest="reset_defaults",
         action="store_true",
         help="restore the default settings: max_workers=1, running_workers=0."
     )
-    parser.add_argument(
+    group.add_argument(
         "--delete-database",
         dest="delete_database",
         action="store_true",
         help="delete the current database and creates a new clean one with "\
              "the default settings."
     )
-    parser.add_argument(
+    group.add_argument(
         "--set-max-workers",
         dest="max_workers",
         type=int,
         help="set number of maximum worker processes."
     )
-    parser.add_argument(
+    group.add_argument(
         "-t", "--get-tasks",
         dest="get_tasks",
         action="store_true",
         help="list all tasks waiting for execution."
     )
-    parser.add_argument(
+    group.add_argument(
         "-d", "--get-tasks-on-due",
         dest="get_tasks_on_due",
         action="store_true",
         help="lists all tasks waiting for execution and are on due."
     )
-    parser.add_argument(
+    group.add_argument(
         "-c", "--get-cron-tasks",
         dest="get_cron_tasks",
         action="store_true",
         help="list all task which are cronjobs."
     )
-    parser.add_argument(
+    group.add_argument(
         "-r", "--get_results",
         dest="get_results",
         action="store_true",
@@ -183,26 +202,38 @@ def get_command_line_arguments():
     return parser.parse_args()
 
 
+# command line argument names and the according commands.
+COMMANDS = (
+    ("info", report_info),
+    ("reset_defaults", reset_defaults),
+    ("max_workers", set_max_workers),
+    ("get_tasks", report_tasks),
+    ("get_tasks_on_due", report_tasks_on_due),
+    ("get_cron_tasks", report_cron_tasks),
+    ("get_results", report_results),
+    ("delete_database", delete_database),
+)
+
+
 def main(args=None):
     """entry point."""
     if not args:
         args = get_command_line_arguments()
-    if args.info:
-        report_info()
-    elif args.reset_defaults:
-        reset_defaults()
-    elif args.max_workers:
-        set_max_workers(args.max_workers)
-    elif args.get_tasks:
-        report_tasks()
-    elif args.get_tasks_on_due:
-        report_tasks_on_due()
-    elif args.get_cron_tasks:
-        report_cron_tasks()
-    elif args.get_results:
-        report_results()
-    elif args.delete_database:
-        delete_database()
+    for name, command in COMMANDS:
+        value = getattr(args, name)
+        if value:
+            break
+    else:
+        return
+    # a flag or an option with a value:
+    arguments = () if value is True else (value,)
+    if command is delete_database:
+        # interactive: don't lock the database while waiting for input
+        command()
+    else:
+        # run the command on a single database connection:
+        with interface.connection():
+            command(*arguments)
 
 
 if __name__ == "__main__":
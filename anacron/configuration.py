@@ -7,6 +7,8 @@ adapt them from web-frameworks (currently django).
 
 import configparser
 import datetime
+import functools
+import os
 import pathlib
 
 try:
@@ -22,12 +24,81 @@ CONFIGURATION_FILE_NAME = "anacron.conf"
 CONFIGURATION_SECTION = "anacron"
 MONITOR_IDLE_TIME = 2.0  # seconds
 WORKER_IDLE_TIME = 4.0  # seconds
+WORKER_MAX_IDLE_TIME = 16.0  # seconds
 RESULT_TTL = 1800  # storage time (time to live) for results in seconds
 CONFIGURABLE_SETTING_NAMES = (
     "monitor_idle_time",
     "worker_idle_time",
+    "worker_max_idle_time",
     "result_ttl",
 )
+_CONFIGURABLE_SETTINGS = frozenset(CONFIGURABLE_SETTING_NAMES)
+# timedelta is immutable and can get shared by all instances:
+_DEFAULT_RESULT_TTL = datetime.timedelta(minutes=RESULT_TTL)
+
+# directories already created by this process:
+_created_directories = set()
+
+# parsed configuration files:
+# {path: ((st_mtime_ns, st_size), settings)}
+_configuration_cache = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_anacron_directory(cwd_posix):
+    """
+    Return the directory as a Path object, where the anacron files
+    are stored for the given current working directory `cwd_posix`
+    (as posix-string). The result is cached, because the directory
+    is a process-wide constant.
+    """
+    cwd = pathlib.Path(cwd_posix)
+    try:
+        home_dir = pathlib.Path().home()
+    except RuntimeError:
+        # can't resolve homedir, take the present working
+        # directory. Depending on the application .gitignore
+        # should get extended with a ".anacron/*" entry.
+        home_dir = cwd
+        prefix = None
+    else:
+        prefix = cwd_posix.replace("/", "_")
+    anacron_dir = home_dir / ".anacron"
+    if prefix:
+        anacron_dir = anacron_dir / prefix
+    if anacron_dir not in _created_directories:
+        # a stat call is cheaper than a failing mkdir call:
+        if not os.path.isdir(anacron_dir):
+            os.makedirs(anacron_dir, exist_ok=True)
+        _created_directories.add(anacron_dir)
+    return anacron_dir
+
+
+def _parse_configuration_file(path):
+    """
+    Parse the configuration file at `path` and return a dictionary with
+    the valid settings found in the anacron-section. Returns an empty
+    dictionary in case of a misconfigured file.
+    """
+    settings_ = {}
+    parser = configparser.ConfigParser()
+    if parser.read(path):
+        # success
+        try:
+            values = parser[CONFIGURATION_SECTION]
+        except KeyError:
+            # ignore misconfigured file
+            pass
+        else:
+            # convert just the settings given in the file:
+            for name in _CONFIGURABLE_SETTINGS.intersection(values):
+                settings_[name] = values.getfloat(name)
+            # invalid values are ignored without raising ValueError:
+            value = values.get("is_active", "").strip().lower()
+            value = parser.BOOLEAN_STATES.get(value)
+            if value is not None:
+                settings_["is_active"] = value
+    return settings_
 
 
 class Configuration:
@@ -36,11 +107,19 @@ class Configuration:
     """
     # pylint: disable=too-many-instance-attributes
     def __init__(self, db_filename=DB_FILE_NAME):
+        # the current working directory of the anacron importing
+        # application. Path values are calculated once here, because
+        # they are accessed in the engine and worker loops.
+        self.cwd = pathlib.Path.cwd()
         self.anacron_path = self._get_anacron_directory()
         self.db_filename = db_filename
+        self.db_file = self.anacron_path / db_filename
+        self.semaphore_file = self.anacron_path / SEMAPHORE_FILE_NAME
+        self.configuration_file = self.anacron_path / CONFIGURATION_FILE_NAME
         self.monitor_idle_time = MONITOR_IDLE_TIME
         self.worker_idle_time = WORKER_IDLE_TIME
-        self.result_ttl = datetime.timedelta(minutes=RESULT_TTL)
+        self.worker_max_idle_time = WORKER_MAX_IDLE_TIME
+        self.result_ttl = _DEFAULT_RESULT_TTL
         self.is_active = True
 #         self._read_configuration()
 
@@ -53,47 +132,29 @@ class Configuration:
             "~.anacron/cwd_prefix/"
 
         """
-        try:
-            home_dir = pathlib.Path().home()
-        except RuntimeError:
-            # can't resolve homedir, take the present working
-            # directory. Depending on the application .gitignore
-            # should get extended with a ".anacron/*" entry.
-            home_dir = self.cwd
-            prefix = None
-        else:
-            prefix = self.cwd.as_posix().replace("/", "_")
-        anacron_dir = home_dir / ".anacron"
-        if prefix:
-            anacron_dir = anacron_dir / prefix
-        anacron_dir.mkdir(exist_ok=True)
-        return anacron_dir
+        return _resolve_anacron_directory(self.cwd.as_posix())
 
     def _read_configuration(self):
         """
         Read configuration data from an optional configuration file.
         The file must be in the anacron-directory named "anacron.conf".
+        A missing file is detected by a single stat call. The parsed
+        values are cached as long as the file is unchanged.
         """
-        parser = configparser.ConfigParser()
-        if parser.read(self.configuration_file):
-            # success
-            try:
-                values = parser[CONFIGURATION_SECTION]
-            except KeyError:
-                # ignore misconfigured file
-                pass
-            else:
-                for name in CONFIGURABLE_SETTING_NAMES:
-                    value = values.getfloat(name)
-                    if value is not None:
-                        self.__dict__[name] = value
-                try:
-                    value = values.getboolean("is_active")
-                    if value is not None:
-                        setattr(self, "is_active", value)
-#                     setattr(self, "is_active", values.getboolean("is_active"))
-                except ValueError:
-                    pass
+        path = self.configuration_file
+        try:
+            stat_result = os.stat(path)
+        except FileNotFoundError:
+            return
+        signature = stat_result.st_mtime_ns, stat_result.st_size
+        try:
+            cached_signature, values = _configuration_cache[path]
+        except KeyError:
+            cached_signature = values = None
+        if cached_signature != signature:
+            values = _parse_configuration_file(path)
+            _configuration_cache[path] = signature, values
+        self.__dict__.update(values)
 
     def get_django_debug_setting(self):
         """
@@ -105,35 +166,6 @@ class Configuration:
         """
         return settings.DEBUG
 
-    @property
-    def configuration_file(self):
-        """
-        Provides the path to the configuration-file.
-        """
-        return self.anacron_path / CONFIGURATION_FILE_NAME
-
-    @property
-    def db_file(self):
-        """
-        Provides the path to the database-file.
-        """
-        return self.anacron_path / self.db_filename
-
-    @property
-    def semaphore_file(self):
-        """
-        Provides the path to the semaphore-file.
-        """
-        return self.anacron_path / SEMAPHORE_FILE_NAME
-
-    @property
-    def cwd(self):
-        """
-        Provides the current working directory.
-        This is the working directory of the anacron importing application.
-        """
-        return pathlib.Path.cwd()
-
     @property
     def is_django_application(self):
         """
@@ -143,4 +175,5 @@ class Configuration:
         return DJANGO_IS_INSTALLED
 
 
-configuration = Configuration()
+# keep an existing instance in case the module gets reloaded:
+configuration = globals().get("configuration") or Configuration()
@@ -48,7 +48,12 @@ def cron(crontab=None,
             crontab=crontab
         )
         schedule = scheduler.get_next_schedule()
-        interface.register_callable(func, schedule=schedule, crontab=crontab)
+        # replace existing cronjobs of func in a single transaction:
+        with interface.connection():
+            interface.delete_cronjobs_by_signature(func)
+            interface.register_callable(
+                func, schedule=schedule, crontab=crontab
+            )
         return func
 
     return wrapper
@@ -61,9 +66,9 @@ def delay(func):
     def wrapper(*args, **kwargs):
         if configuration.is_active:
             uid = uuid.uuid4().hex
-            data = {"args": args, "kwargs": kwargs, "uuid": uid}
-            interface.register_callable(func, **data)
-            interface.register_result(func, **data)
+            interface.register_delayed_callable(
+                func, uid, args=args, kwargs=kwargs
+            )
             return uid
         return func(*args, **kwargs)
     return wrapper
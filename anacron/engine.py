@@ -4,6 +4,7 @@ engine.py
 Implementation of the anacron engine and the worker monitor.
 """
 
+import functools
 import pathlib
 import signal
 import subprocess
@@ -11,10 +12,14 @@ import sys
 import threading
 
 from .configuration import configuration
-from .sql_interface import interface
+from .sql_interface import get_interface
 
 
 WORKER_MODULE_NAME = "worker.py"
+WORKER_COMMAND = (
+    sys.executable,
+    str(pathlib.Path(__file__).parent / WORKER_MODULE_NAME),
+)
 
 
 def start_subprocess(database_file=None):
@@ -23,47 +28,37 @@ def start_subprocess(database_file=None):
     An optional `database_file` will get forwarded to the worker to use
     this instead of the configured one. This argument is for testing.
     """
-    worker_file = pathlib.Path(__file__).parent / WORKER_MODULE_NAME
-    cmd = [sys.executable, worker_file]
+    cmd = WORKER_COMMAND
     if database_file:
-        cmd.append(database_file)
-    cwd = configuration.cwd
-    return subprocess.Popen(cmd, cwd=cwd)
-
-
-def start_worker_monitor(exit_event, database_file=None):
-    """
-    Monitors the subprocess and start/restart if the process is not up.
-    """
-    process = None
-    while True:
-        if process is None or process.poll() is not None:
-            process = start_subprocess(database_file)
-        if exit_event.wait(timeout=configuration.monitor_idle_time):
-            break
-    # got exit event: terminate worker
-    # running_worker decrement is triggered in the stop() method
-    # (which is the termination handler registered in the main thread)
-    process.terminate()
+        cmd = [*cmd, database_file]
+    return subprocess.Popen(cmd, cwd=configuration.cwd)
 
 
 class Engine:
     """
-    The Engine is the entry-point for anacron. On import an Entry
-    instance gets created and the method start is called. Depending on
-    the configuration will start the worker-monitor and the background
-    process. If the (auto-)configuration is not active, the method start
-    will just return doing nothing.
+    The Engine is the entry-point for anacron. The instance gets created
+    on the first call of get_engine(), which happens on anacron.start()
+    and not on import. Depending on the configuration the method start
+    will start the worker-monitor and the background process. If the
+    (auto-)configuration is not active, the method start will just
+    return doing nothing.
     """
-    # pylint: disable=redefined-outer-name
-    def __init__(self, interface=interface):
+    def __init__(self, interface=None):
+        if interface is None:
+            interface = get_interface()
         self.interface = interface  # allow dependency injection for tests
         self.exit_event = threading.Event()
         self.monitor_thread = None
-        self.original_handlers = {
-            signalnum: signal.signal(signalnum, self._terminate)
-            for signalnum in (signal.SIGINT, signal.SIGTERM)
-        }
+        self.worker_process = None
+        # guards starting and terminating the worker process:
+        self.process_lock = threading.RLock()
+        self.original_handlers = {}
+        # signal-handlers can only get set from the main thread:
+        if threading.current_thread() is threading.main_thread():
+            self.original_handlers = {
+                signalnum: signal.signal(signalnum, self._terminate)
+                for signalnum in (signal.SIGINT, signal.SIGTERM)
+            }
 
     def is_start_allowed(self):
         """
@@ -96,11 +91,29 @@ class Engine:
         if self.is_start_allowed():
             # start monitor thread
             self.monitor_thread = threading.Thread(
-                target=start_worker_monitor,
-                args=(self.exit_event, database_file)
+                target=self.monitor_worker,
+                args=(database_file,)
             )
             self.monitor_thread.start()
 
+    def monitor_worker(self, database_file=None):
+        """
+        Starts the worker process and restarts it if the process is not
+        up. Runs in the monitor thread and blocks in `wait()` as long as
+        the worker is running, so there is no polling. The worker gets
+        terminated by the stop() method.
+        """
+        while True:
+            with self.process_lock:
+                if self.exit_event.is_set():
+                    break
+                self.worker_process = start_subprocess(database_file)
+            self.worker_process.wait()
+            # worker has terminated: throttle the restart and leave in
+            # case of an exit event.
+            if self.exit_event.wait(timeout=configuration.monitor_idle_time):
+                break
+
     def stop(self):
         """
         Shut down monitor thread and release semaphore file. `args`
@@ -110,21 +123,42 @@ class Engine:
         shut down, both arguments are ignored.
         """
         if self.monitor_thread:  # and self.monitor_thread.is_alive():
-            self.exit_event.set()
+            with self.process_lock:
+                self.exit_event.set()
+                if self.worker_process:
+                    self.worker_process.terminate()
             self.monitor_thread = None
             self.interface.decrement_running_workers()
 
     def _terminate(self, signalnum, stackframe=None):
-
         """
-        Terminate anacron by calling the engine.stop method. Afterward
-        reraise the signal again for the original signal-handler.
+        Signal-handler: terminate anacron by calling the engine.stop
+        method and reraise the signal for the original signal-handler.
+        In case the signal has interrupted a transaction, this happens
+        after the transaction has ended. Otherwise the decrement of the
+        running workers would get rolled back, when the process dies.
         """
         # stackframe may be given to the signal-handler, but is unused
         # pylint: disable=unused-argument
+        self.interface.run_after_transaction(
+            functools.partial(self._stop_and_reraise, signalnum)
+        )
+
+    def _stop_and_reraise(self, signalnum):
+        """
+        Stop the engine, restore the original signal-handlers and
+        reraise the signal.
+        """
         self.stop()
-        signal.signal(signalnum, self.original_handlers[signalnum])
+        for signum, handler in self.original_handlers.items():
+            signal.signal(signum, handler)
         signal.raise_signal(signalnum)  # requires Python >= 3.8
 
 
-engine = Engine()
+@functools.lru_cache(maxsize=None)
+def get_engine():
+    """
+    Returns the Engine instance. The instance gets created on the first
+    call, so importing anacron does not install signal-handlers.
+    """
+    return Engine()
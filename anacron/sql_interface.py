@@ -4,9 +4,13 @@ sql_interface.py
 SQLite interface for storing tasks
 """
 
+import atexit
+import contextlib
 import datetime
+import os
 import pickle
 import sqlite3
+import threading
 import types
 
 from .configuration import configuration
@@ -24,6 +28,10 @@ CREATE TABLE IF NOT EXISTS {DB_TABLE_NAME_TASK}
     function_arguments BLOB
 )
 """
+CMD_CREATE_TASK_INDEX = f"""
+CREATE INDEX IF NOT EXISTS idx_task_function
+ON {DB_TABLE_NAME_TASK} (function_module, function_name)
+"""
 CMD_STORE_TASK = f"""
 INSERT INTO {DB_TABLE_NAME_TASK} VALUES
 (
@@ -42,14 +50,24 @@ CMD_GET_TASKS_BY_NAME = f"""\
     SELECT {TASK_COLUMN_SEQUENCE} FROM {DB_TABLE_NAME_TASK}
     WHERE function_module == ? AND function_name == ?"""
 CMD_GET_TASKS_ON_DUE = f"""\
-    SELECT {TASK_COLUMN_SEQUENCE} FROM {DB_TABLE_NAME_TASK} WHERE schedule <= ?"""
+    SELECT {TASK_COLUMN_SEQUENCE} FROM {DB_TABLE_NAME_TASK}
+    WHERE schedule <= ? ORDER BY schedule LIMIT ?"""
 CMD_GET_TASKS = f"""\
     SELECT {TASK_COLUMN_SEQUENCE} FROM {DB_TABLE_NAME_TASK}"""
 CMD_UPDATE_SCHEDULE = f"\
     UPDATE {DB_TABLE_NAME_TASK} SET schedule = ? WHERE rowid == ?"
 CMD_DELETE_TASK = f"DELETE FROM {DB_TABLE_NAME_TASK} WHERE rowid == ?"
+CMD_DELETE_TASKS = f"""\
+    DELETE FROM {DB_TABLE_NAME_TASK} WHERE rowid IN ({{placeholders}})"""
+# max. number of rowids per IN-list, below the SQLite parameter limit:
+DELETE_TASKS_CHUNK_SIZE = 500
 CMD_DELETE_CRON_TASKS = f"DELETE FROM {DB_TABLE_NAME_TASK} WHERE crontab <> ''"
+CMD_DELETE_CRON_TASKS_BY_NAME = f"""\
+    DELETE FROM {DB_TABLE_NAME_TASK}
+    WHERE function_module == ? AND function_name == ? AND crontab <> ''"""
 CMD_COUNT_TABLE_ROWS = "SELECT COUNT(*) FROM {table_name}"
+CMD_COUNT_TASKS_ON_DUE = f"""\
+    SELECT COUNT(*) FROM {DB_TABLE_NAME_TASK} WHERE schedule <= ?"""
 
 DB_TABLE_NAME_RESULT = "result"
 CMD_CREATE_RESULT_TABLE = f"""
@@ -65,6 +83,10 @@ CREATE TABLE IF NOT EXISTS {DB_TABLE_NAME_RESULT}
     ttl datetime
 )
 """
+CMD_CREATE_RESULT_INDEX = f"""
+CREATE INDEX IF NOT EXISTS idx_result_status_ttl
+ON {DB_TABLE_NAME_RESULT} (status, ttl)
+"""
 
 # Status codes are needed for the result-entries:
 TASK_STATUS_WAITING = 0
@@ -87,6 +109,9 @@ INSERT INTO {DB_TABLE_NAME_RESULT} VALUES
 RESULT_COLUMN_SEQUENCE =\
     "rowid,uuid,status,function_module,function_name,"\
     "function_arguments,function_result,error_message, ttl"
+RESULT_COLUMNS = tuple(
+    name.strip() for name in RESULT_COLUMN_SEQUENCE.split(",")
+)
 CMD_GET_RESULTS = f"SELECT {RESULT_COLUMN_SEQUENCE} FROM {DB_TABLE_NAME_RESULT}"
 CMD_GET_RESULT_BY_UUID = f"""\
     SELECT {RESULT_COLUMN_SEQUENCE} FROM {DB_TABLE_NAME_RESULT}
@@ -105,6 +130,17 @@ CMD_DELETE_OUTDATED_RESULTS = f"""\
     WHERE status == {TASK_STATUS_READY} AND ttl <= ?"""
 
 
+# datetimes stored as ISO-text by former versions:
+CMD_GET_TEXT_DATETIMES = """\
+    SELECT rowid, {column} FROM {table_name} WHERE typeof({column}) == 'text'"""
+CMD_UPDATE_TEXT_DATETIME = """\
+    UPDATE {table_name} SET {column} = ? WHERE rowid == ?"""
+TEXT_DATETIME_COLUMNS = (
+    (DB_TABLE_NAME_TASK, "schedule"),
+    (DB_TABLE_NAME_RESULT, "ttl"),
+)
+
+
 DB_TABLE_NAME_SETTINGS = "settings"
 CMD_CREATE_SETTINGS_TABLE = f"""
 CREATE TABLE IF NOT EXISTS {DB_TABLE_NAME_SETTINGS}
@@ -115,6 +151,10 @@ CREATE TABLE IF NOT EXISTS {DB_TABLE_NAME_SETTINGS}
 """
 
 MAX_WORKERS_DEFAULT = 1
+# pickle is backed by the C-implementation _pickle:
+PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+# max. number of tasks on due returned at once, -1 is unlimited:
+TASKS_ON_DUE_LIMIT = 256
 
 CMD_SETTINGS_STORE_VALUES = f"""
 INSERT INTO {DB_TABLE_NAME_SETTINGS} VALUES
@@ -124,6 +164,7 @@ INSERT INTO {DB_TABLE_NAME_SETTINGS} VALUES
 )
 """
 SETTINGS_COLUMN_SEQUENCE = "rowid,max_workers,running_workers"
+SETTINGS_COLUMNS = tuple(SETTINGS_COLUMN_SEQUENCE.split(","))
 CMD_SETTINGS_GET_SETTINGS = f"""
     SELECT {SETTINGS_COLUMN_SEQUENCE} FROM {DB_TABLE_NAME_SETTINGS}"""
 CMD_SETTINGS_UPDATE = f"""
@@ -131,28 +172,56 @@ CMD_SETTINGS_UPDATE = f"""
         max_workers = ?,
         running_workers = ?
     WHERE rowid == ?"""
+CMD_SETTINGS_INCREMENT_RUNNING_WORKERS = f"""
+    UPDATE {DB_TABLE_NAME_SETTINGS} SET
+        running_workers = running_workers + 1"""
+CMD_SETTINGS_DECREMENT_RUNNING_WORKERS = f"""
+    UPDATE {DB_TABLE_NAME_SETTINGS} SET
+        running_workers = running_workers - 1
+    WHERE running_workers > 0"""
+CMD_SETTINGS_TRY_INCREMENT_RUNNING_WORKERS = f"""
+    UPDATE {DB_TABLE_NAME_SETTINGS} SET
+        running_workers = running_workers + 1
+    WHERE running_workers < max_workers"""
+
+
+IN_MEMORY_DB_NAME = ":memory:"
+CMD_PRAGMA_JOURNAL_MODE = "PRAGMA journal_mode=WAL"
+CMD_PRAGMA_SYNCHRONOUS = "PRAGMA synchronous=NORMAL"
+CMD_PRAGMA_MMAP_SIZE = "PRAGMA mmap_size=268435456"  # 256 MiB
+CMD_PRAGMA_CACHE_SIZE = "PRAGMA cache_size=-65536"  # 64 MiB
+CMD_PRAGMA_TEMP_STORE = "PRAGMA temp_store=MEMORY"
+
 
+# sqlite3 default adapters and converters deprecated as of Python 3.12.
+# Datetimes (naive, local time) are stored as integer microseconds since
+# 1970-01-01. The conversion is exact and faster than ISO-formating and
+# the database compares integers for the schedules and ttls.
+# Adapter and converter are called explicitly and not registered with
+# the sqlite3 module, because a registration is process-wide and would
+# change the storage of datetimes for other sqlite3 users of the
+# hosting application.
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds=1)
 
-# sqlite3 default adapters and converters deprecated as of Python 3.12:
 
 def datetime_adapter(value):
     """
-    Gets a python datetime-instance and returns an ISO 8601 formated
-    string for sqlite3 storage.
+    Gets a python datetime-instance and returns the microseconds since
+    EPOCH as integer for sqlite3 storage. Timezone aware datetimes get
+    converted to naive local time first.
     """
-    return value.isoformat()
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - EPOCH) // MICROSECOND
 
 
 def datetime_converter(value):
     """
-    Gets an ISO 8601 formated byte-string (from sqlite3) and returns a
-    python datetime datatype.
+    Gets the microseconds since EPOCH as integer (from sqlite3) and
+    returns a python datetime datatype.
     """
-    return datetime.datetime.fromisoformat(value.decode())
-
-
-sqlite3.register_adapter(datetime.datetime, datetime_adapter)
-sqlite3.register_converter("datetime", datetime_converter)
+    return EPOCH + datetime.timedelta(microseconds=value)
 
 
 # pylint does not like instances with dynamic attributes:
@@ -183,9 +252,9 @@ class HybridNamespace(types.SimpleNamespace):
 
     def __str__(self):
         # same as __repr__ but without the rowid
-        lines = repr(self).split("\n")
-        lines = [line for line in lines if not line.startswith("rowid")]
-        return "\n".join(lines)
+        return "\n".join(
+            f"{k}:{v}" for k, v in self.__dict__.items() if k != "rowid"
+        )
 
 
 class TaskResult(HybridNamespace):
@@ -219,21 +288,28 @@ class TaskResult(HybridNamespace):
         Returns a new TaskResult-Instance initialized with a tuple
         representing the data from result-table row.
         """
-        column_names = RESULT_COLUMN_SEQUENCE.split(",")
-        data = dict(zip(column_names, row_data))
-        instance = cls(data)
-        instance.function_result = pickle.loads(instance.function_result)
-        instance.function_arguments = pickle.loads(instance.function_arguments)
-        return instance
+        data = dict(zip(RESULT_COLUMNS, row_data))
+        data["ttl"] = datetime_converter(data["ttl"])
+        data["function_arguments"] = pickle.loads(data["function_arguments"])
+        if data["function_result"] is not None:
+            data["function_result"] = pickle.loads(data["function_result"])
+        return cls(data)
 
 
-class SQLiteInterface:
+class SQLiteInterface:  # pylint: disable=too-many-public-methods
     """
     SQLite interface for application specific operations.
     """
 
-    def __init__(self, db_name=":memory:"):
+    def __init__(self, db_name=IN_MEMORY_DB_NAME):
         self.db_name = db_name
+        # a single connection is used for the lifetime of the
+        # instance. The lock serializes access from different threads.
+        self._connection = None
+        self._in_transaction = False
+        # callables to run after the current transaction has ended:
+        self._after_transaction = []
+        self._lock = threading.RLock()
         self._init_database()
 
     def _init_database(self):
@@ -242,31 +318,172 @@ class SQLiteInterface:
         and in case of missing settings set the settings-default values.
         """
         self._create_tables()
+        self._convert_text_datetimes()
         self._initialize_settings_table()
 
+    def _run(self, action):
+        """
+        Calls `action` with the connection as argument and returns the
+        result. Outside of a `connection()` block `action` runs in a
+        transaction of its own. The lock is held until `action` has
+        returned, so `action` must not return a cursor: a commit or
+        rollback of another thread would reset the cursor (Python < 3.11).
+        """
+        with self._lock:
+            con = self._get_connection()
+            if self._in_transaction:
+                return action(con)
+            with con:
+                return action(con)
+
     def _execute(self, cmd, parameters=()):
         """
         Run a command with parameters. Parameters can be a sequence of
         values to get used in an ordered way or a dictionary with
         key-value pairs, where the key are the value-names used in the
-        db (i.e. the column names).
+        db (i.e. the column names). Returns the number of modified rows.
+        """
+        return self._run(lambda con: con.execute(cmd, parameters).rowcount)
+
+    def _executemany(self, cmd, seq_of_parameters):
+        """
+        Run a command for every parameters in `seq_of_parameters` in a
+        single transaction. Parameters are the same as for `_execute()`.
+        """
+        return self._run(
+            lambda con: con.executemany(cmd, seq_of_parameters).rowcount
+        )
+
+    def _fetchall(self, cmd, parameters=()):
+        """
+        Run a query with parameters like `_execute()` and return all
+        selected rows as a list of tuples.
+        """
+        return self._run(lambda con: con.execute(cmd, parameters).fetchall())
+
+    def _fetchone(self, cmd, parameters=()):
+        """
+        Run a query with parameters like `_execute()` and return the
+        first selected row as tuple or None.
+        """
+        return self._run(lambda con: con.execute(cmd, parameters).fetchone())
+
+    def _connect(self):
+        """
+        Returns a new connection to the database.
         """
         con = sqlite3.connect(
             self.db_name,
-            detect_types=sqlite3.PARSE_DECLTYPES
+            check_same_thread=False,
         )
-        with con:
-            return con.execute(cmd, parameters)
+        if self.db_name != IN_MEMORY_DB_NAME:
+            # write-ahead logging allows reading while writing and
+            # needs less syncing. In case WAL is not supported, keep
+            # the default synchronous mode.
+            (journal_mode,) = con.execute(CMD_PRAGMA_JOURNAL_MODE).fetchone()
+            if journal_mode == "wal":
+                con.execute(CMD_PRAGMA_SYNCHRONOUS)
+            # the task-table gets polled frequently: serve reads from
+            # the memory-map and the page-cache.
+            con.execute(CMD_PRAGMA_MMAP_SIZE)
+        con.execute(CMD_PRAGMA_CACHE_SIZE)
+        con.execute(CMD_PRAGMA_TEMP_STORE)
+        return con
+
+    def _get_connection(self):
+        """
+        Returns the connection to the database. The connection gets
+        opened on first access and after a call of close().
+        """
+        if self._connection is None:
+            self._connection = self._connect()
+        return self._connection
+
+    def close(self):
+        """
+        Close the connection to the database. The connection gets
+        reopened on the next database access.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        Context manager to run all commands inside the with-block in a
+        single transaction. Other threads are blocked for the duration
+        of the with-block. Nested calls run in the outer transaction.
+        """
+        with self._lock:
+            con = self._get_connection()
+            if self._in_transaction:
+                yield con
+                return
+            self._in_transaction = True
+            try:
+                yield con
+                # connection may have been closed in the with-block:
+                if self._connection is con:
+                    con.commit()
+            except BaseException:
+                if self._connection is con:
+                    con.rollback()
+                raise
+            finally:
+                self._in_transaction = False
+                callables, self._after_transaction = (
+                    self._after_transaction, []
+                )
+                for func in callables:
+                    func()
+
+    def run_after_transaction(self, func):
+        """
+        Calls `func` without arguments at once or, if the current thread
+        runs a transaction, after the transaction has ended. This is for
+        signal-handlers, as a signal may interrupt a transaction of the
+        main thread and the transaction gets rolled back if the process
+        terminates.
+        """
+        with self._lock:
+            # holding the lock, a running transaction belongs to the
+            # current thread:
+            if self._in_transaction:
+                self._after_transaction.append(func)
+                return
+        func()
 
     def _create_tables(self):
         """
         Create all used tables in case of a new db and missing tables.
         """
         self._execute(CMD_CREATE_TASK_TABLE)
+        self._execute(CMD_CREATE_TASK_INDEX)
         self._execute(CMD_CREATE_RESULT_TABLE)
+        self._execute(CMD_CREATE_RESULT_INDEX)
         self._execute(CMD_CREATE_SETTINGS_TABLE)
 
 
+    def _convert_text_datetimes(self):
+        """
+        Databases of former versions have stored the schedules and
+        result ttls as ISO-formatted text. Such values are never on due
+        compared to the integers and can not get converted on reading.
+        Convert them to integers (as stored by this version).
+        """
+        for table_name, column in TEXT_DATETIME_COLUMNS:
+            names = {"table_name": table_name, "column": column}
+            rows = self._fetchall(CMD_GET_TEXT_DATETIMES.format(**names))
+            if rows:
+                self._executemany(
+                    CMD_UPDATE_TEXT_DATETIME.format(**names),
+                    [(datetime_adapter(
+                        datetime.datetime.fromisoformat(value)), rowid)
+                     for rowid, value in rows]
+                )
+
     def _count_table_rows(self, table_name):
         """
         Helper function to count the number of entries in the given
@@ -274,8 +491,7 @@ class SQLiteInterface:
         a sqlite3.OperationalError will get raised.
         """
         cmd = CMD_COUNT_TABLE_ROWS.format(table_name=table_name)
-        cursor = self._execute(cmd)
-        number_of_rows = cursor.fetchone()[0]
+        (number_of_rows,) = self._fetchone(cmd)
         return number_of_rows
 
     def _initialize_settings_table(self):
@@ -292,9 +508,9 @@ class SQLiteInterface:
     # -- task-methods ---
 
     @staticmethod
-    def _fetch_all_callable_entries(cursor):
+    def _fetch_all_callable_entries(rows):
         """
-        Internal function to iterate over a selection of entries and unpack
+        Internal function to iterate over selected `rows` and unpack
         the columns to a dictionary with the following key-value pairs:
 
             {
@@ -314,25 +530,37 @@ class SQLiteInterface:
         def process(row):
             """
             Gets a `row` and returns a dictionary with Python datatypes.
-            `row` is an ordered tuple of columns as defined in `CREATE
-            TABLE`. The blob column with the pickled arguments is the
-            last column.
+            `row` is an ordered tuple of columns as defined in
+            `TASK_COLUMN_SEQUENCE`. The blob column with the pickled
+            arguments is the last column.
             """
-            args, kwargs = pickle.loads(row[-1])
-            data = {
-                key: row[i] for i, key in enumerate(
-                    TASK_COLUMN_SEQUENCE.strip().split(",")[:-1]
-                )
-            }
-            data["args"] = args
-            data["kwargs"] = kwargs
-            return HybridNamespace(data)
-        return [process(row) for row in cursor.fetchall()]
+            (
+                rowid,
+                uuid,
+                schedule,
+                crontab,
+                function_module,
+                function_name,
+                function_arguments,
+            ) = row
+            args, kwargs = pickle.loads(function_arguments)
+            return HybridNamespace({
+                "rowid": rowid,
+                "uuid": uuid,
+                "schedule": datetime_converter(schedule),
+                "crontab": crontab,
+                "function_module": function_module,
+                "function_name": function_name,
+                "args": args,
+                "kwargs": kwargs,
+            })
+        return [process(row) for row in rows]
 
     # pylint: disable=too-many-arguments
-    def register_callable(
-        self,
+    @staticmethod
+    def _get_task_data(
         func,
+        *,
         uuid="",
         schedule=None,
         crontab="",
@@ -340,39 +568,78 @@ class SQLiteInterface:
         kwargs=None,
     ):
         """
-        Store a callable in the task-table of the database.
+        Returns a dictionary with the column values of a task-table row
+        for the given callable.
         """
         if not schedule:
             schedule = datetime.datetime.now()
         if not kwargs:
             kwargs = {}
-        arguments = pickle.dumps((args, kwargs))
-        data = {
+        arguments = pickle.dumps((args, kwargs), protocol=PICKLE_PROTOCOL)
+        return {
             "uuid": uuid,
-            "schedule": schedule,
+            "schedule": datetime_adapter(schedule),
             "crontab": crontab,
             "function_module": func.__module__,
             "function_name": func.__name__,
             "function_arguments": arguments,
         }
+
+    def register_callable(
+        self,
+        func,
+        uuid="",
+        schedule=None,
+        crontab="",
+        args=(),
+        kwargs=None,
+    ):
+        """
+        Store a callable in the task-table of the database.
+        """
+        data = self._get_task_data(
+            func,
+            uuid=uuid,
+            schedule=schedule,
+            crontab=crontab,
+            args=args,
+            kwargs=kwargs,
+        )
         self._execute(CMD_STORE_TASK, data)
 
+    def register_callables(self, tasks):
+        """
+        Store multiple callables in the task-table of the database in a
+        single transaction. `tasks` is an iterable of tuples with the
+        callable and a dictionary with the keyword-arguments of
+        `register_callable()`:
+
+            [(func, {"schedule": schedule, "args": args}), (func, {})]
+
+        """
+        data = [self._get_task_data(func, **options) for func, options in tasks]
+        self._executemany(CMD_STORE_TASK, data)
+
     def get_tasks(self):
         """
         Generic method to return all tasks as a list of HybridNamespace
         instances.
         """
-        cursor = self._execute(CMD_GET_TASKS)
-        return self._fetch_all_callable_entries(cursor)
+        rows = self._fetchall(CMD_GET_TASKS)
+        return self._fetch_all_callable_entries(rows)
 
-    def get_tasks_on_due(self, schedule=None):
+    def get_tasks_on_due(self, schedule=None, limit=TASKS_ON_DUE_LIMIT):
         """
-        Returns tasks on due as a list of HybridNamespace instances.
+        Returns tasks on due as a list of HybridNamespace instances,
+        ordered by schedule. At most `limit` tasks are returned, so a
+        large backlog (i.e. after a downtime) gets handled in slices.
+        A `limit` of -1 returns all tasks on due.
         """
         if not schedule:
             schedule = datetime.datetime.now()
-        cursor = self._execute(CMD_GET_TASKS_ON_DUE, [schedule])
-        return self._fetch_all_callable_entries(cursor)
+        parameters = datetime_adapter(schedule), limit
+        rows = self._fetchall(CMD_GET_TASKS_ON_DUE, parameters)
+        return self._fetch_all_callable_entries(rows)
 
     def get_tasks_by_signature(self, func):
         """
@@ -380,8 +647,8 @@ class SQLiteInterface:
         HybridNamespace instances.
         """
         parameters = func.__module__, func.__name__
-        cursor = self._execute(CMD_GET_TASKS_BY_NAME, parameters)
-        return self._fetch_all_callable_entries(cursor)
+        rows = self._fetchall(CMD_GET_TASKS_BY_NAME, parameters)
+        return self._fetch_all_callable_entries(rows)
 
     def delete_callable(self, entry):
         """
@@ -391,19 +658,70 @@ class SQLiteInterface:
         """
         self._execute(CMD_DELETE_TASK, [entry["rowid"]])
 
+    def delete_callables(self, entries):
+        """
+        Delete multiple entries in the callable-table in a single
+        transaction. Entries are dictionaries as returned from
+        `get_tasks_on_due()`.
+        """
+        rowids = [entry["rowid"] for entry in entries]
+        with self.connection():
+            self._delete_tasks(rowids)
+
+    def _delete_tasks(self, rowids):
+        """
+        Delete the tasks with the given `rowids` by IN-lists of at most
+        `DELETE_TASKS_CHUNK_SIZE` rowids per statement.
+        """
+        for i in range(0, len(rowids), DELETE_TASKS_CHUNK_SIZE):
+            chunk = rowids[i:i + DELETE_TASKS_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            self._execute(
+                CMD_DELETE_TASKS.format(placeholders=placeholders), chunk
+            )
+
     def delete_cronjobs(self):
         """
         Delete all cronjobs from the task-table.
         """
         self._execute(CMD_DELETE_CRON_TASKS)
 
+    def delete_cronjobs_by_signature(self, func):
+        """
+        Delete all cronjobs matching the function-signature from the
+        task-table with a single command.
+        """
+        parameters = func.__module__, func.__name__
+        self._execute(CMD_DELETE_CRON_TASKS_BY_NAME, parameters)
+
     def update_schedule(self, rowid, schedule):
         """
         Update the `schedule` of the table entry with the given `rowid`.
         """
-        parameters = schedule, rowid
+        parameters = datetime_adapter(schedule), rowid
         self._execute(CMD_UPDATE_SCHEDULE, parameters)
 
+    def finalize_tasks(self, rowids=(), schedules=(), results=()):
+        """
+        Delete the tasks with the given `rowids` and update the tasks
+        given by `schedules`, a sequence of `(schedule, rowid)` tuples,
+        with the new schedules. `results` is a sequence of
+        `(uuid, function_result, error_message)` tuples, with the
+        already pickled `function_result`, to update the corresponding
+        result-entries. All in a single transaction.
+        """
+        with self.connection():
+            self._executemany(
+                CMD_UPDATE_RESULT,
+                [self._get_result_update_data(*result) for result in results]
+            )
+            self._delete_tasks(list(rowids))
+            self._executemany(
+                CMD_UPDATE_SCHEDULE,
+                [(datetime_adapter(schedule), rowid)
+                 for schedule, rowid in schedules]
+            )
+
     def count_tasks(self):
         """
         Returns the number of rows in the task-table, therefore
@@ -411,68 +729,142 @@ class SQLiteInterface:
         """
         return self._count_table_rows(DB_TABLE_NAME_TASK)
 
+    def count_tasks_on_due(self, schedule=None):
+        """
+        Returns the number of tasks on due without fetching and
+        unpickling the rows.
+        """
+        if not schedule:
+            schedule = datetime.datetime.now()
+        parameters = (datetime_adapter(schedule),)
+        (number_of_tasks,) = self._fetchone(CMD_COUNT_TASKS_ON_DUE, parameters)
+        return number_of_tasks
+
 
     # -- result-methods ---
 
     @staticmethod
     def _get_result_ttl():
-        return datetime.datetime.now() + configuration.result_ttl
+        """
+        Returns the ttl for a new result as stored in the database.
+        """
+        return datetime_adapter(
+            datetime.datetime.now() + configuration.result_ttl
+        )
 
-    def register_result(
-            self,
+    @classmethod
+    def _get_result_data(
+            cls,
             func,
             uuid,
+            *,
             args=(),
             status=TASK_STATUS_WAITING,
             kwargs=None,
+            arguments=None,
         ):
         """
-        Register an entry in the result table of the database. The entry
-        stores the uuid and the status `False` as zero `0` because the
-        task is pending and no result available jet.
+        Returns a dictionary with the column values of a result-table
+        row for the given callable. `arguments` are the already pickled
+        `args` and `kwargs`, if given.
         """
-        if not kwargs:
-            kwargs = {}
-        arguments = pickle.dumps((args, kwargs))
-        data = {
+        if arguments is None:
+            arguments = pickle.dumps(
+                (args, kwargs or {}), protocol=PICKLE_PROTOCOL
+            )
+        return {
             "uuid": uuid,
             "status": status,
             "function_module": func.__module__,
             "function_name": func.__name__,
             "function_arguments": arguments,
-            "function_result": pickle.dumps(None),
+            "function_result": None,  # NULL until a result is available
             "error_message": "",
-            "ttl": self._get_result_ttl(),
+            "ttl": cls._get_result_ttl(),
         }
+
+    def register_result(
+            self,
+            func,
+            uuid,
+            args=(),
+            status=TASK_STATUS_WAITING,
+            kwargs=None,
+        ):
+        """
+        Register an entry in the result table of the database. The entry
+        stores the uuid and the status `False` as zero `0` because the
+        task is pending and no result available jet.
+        """
+        data = self._get_result_data(
+            func, uuid, args=args, status=status, kwargs=kwargs
+        )
         self._execute(CMD_STORE_RESULT, data)
 
+    def register_delayed_callable(self, func, uuid, args=(), kwargs=None):
+        """
+        Store a callable in the task-table and a waiting entry for the
+        result in the result-table in a single transaction. The
+        arguments get pickled once for both tables.
+        """
+        task_data = self._get_task_data(
+            func, uuid=uuid, args=args, kwargs=kwargs
+        )
+        result_data = self._get_result_data(
+            func, uuid, arguments=task_data["function_arguments"]
+        )
+        with self.connection():
+            self._execute(CMD_STORE_TASK, task_data)
+            self._execute(CMD_STORE_RESULT, result_data)
+
+    def register_results(self, results):
+        """
+        Register multiple entries in the result table of the database in
+        a single transaction. `results` is an iterable of tuples with the
+        callable and a dictionary with the keyword-arguments of
+        `register_result()` (`uuid` is required).
+        """
+        data = [
+            self._get_result_data(func, **options) for func, options in results
+        ]
+        self._executemany(CMD_STORE_RESULT, data)
+
     def get_results(self):
         """Generic method to return all results"""
-        cursor = self._execute(CMD_GET_RESULTS)
-        rows = cursor.fetchall()
+        rows = self._fetchall(CMD_GET_RESULTS)
         return [TaskResult.from_data_tuple(row) for row in rows]
 
     def get_result_by_uuid(self, uuid):
         """
         Return a dataset (as TaskResult) or None.
         """
-        cursor = self._execute(CMD_GET_RESULT_BY_UUID, (uuid,))
-        row = cursor.fetchone()  # tuple of data or None
+        row = self._fetchone(CMD_GET_RESULT_BY_UUID, (uuid,))  # tuple or None
         if row:
             result = TaskResult.from_data_tuple(row)
         else:
             result = None
         return result
 
+    @classmethod
+    def _get_result_update_data(cls, uuid, function_result, error_message=""):
+        """
+        Returns the parameters for `CMD_UPDATE_RESULT` to set the
+        result-entry with the given `uuid` to status 1|2.
+        `function_result` is the pickled result.
+        """
+        status = TASK_STATUS_ERROR if error_message else TASK_STATUS_READY
+        ttl = cls._get_result_ttl()
+        return status, function_result, error_message, ttl, uuid
+
     def update_result(self, uuid, result=None, error_message=""):
         """
         Updates the result-entry with the given `uuid` to status 1|2 and
         stores the `result` or `error_message`.
         """
-        status = TASK_STATUS_ERROR if error_message else TASK_STATUS_READY
-        function_result = pickle.dumps(result)
-        ttl = self._get_result_ttl()
-        parameters = status, function_result, error_message, ttl, uuid
+        function_result = pickle.dumps(result, protocol=PICKLE_PROTOCOL)
+        parameters = self._get_result_update_data(
+            uuid, function_result, error_message
+        )
         self._execute(CMD_UPDATE_RESULT, parameters)
 
     def count_results(self):
@@ -487,7 +879,7 @@ class SQLiteInterface:
         Deletes results with status TASK_STATUS_READY that have exceeded
         the time to live (ttl).
         """
-        now = datetime.datetime.now()
+        now = datetime_adapter(datetime.datetime.now())
         self._execute(CMD_DELETE_OUTDATED_RESULTS, (now,))
 
     # -- setting-methods ---
@@ -499,11 +891,8 @@ class SQLiteInterface:
         - running_workers
         - rowid (not a setting but included)
         """
-        cursor = self._execute(CMD_SETTINGS_GET_SETTINGS)
-        row = cursor.fetchone()  # there is only one row
-        col_names = SETTINGS_COLUMN_SEQUENCE.split(",")
-        data = dict(zip(col_names, row))
-        return HybridNamespace(data)
+        row = self._fetchone(CMD_SETTINGS_GET_SETTINGS)  # just one row
+        return HybridNamespace(dict(zip(SETTINGS_COLUMNS, row)))
 
     def set_settings(self, settings):
         """
@@ -522,33 +911,60 @@ class SQLiteInterface:
         """
         Increment the running_worker setting by 1.
         """
-        settings = self.get_settings()
-        settings.running_workers += 1
-        self.set_settings(settings)
+        self._execute(CMD_SETTINGS_INCREMENT_RUNNING_WORKERS)
 
     def decrement_running_workers(self):
         """
         Decrement the running_worker setting by 1.
         But don't allow a value below zero.
         """
-        settings = self.get_settings()
-        if settings.running_workers > 0:
-            settings.running_workers -= 1
-            self.set_settings(settings)
+        self._execute(CMD_SETTINGS_DECREMENT_RUNNING_WORKERS)
 
     def try_increment_running_workers(self):
         """
         Increment the running_worker with a test whether it is allowed
-        or not. Returns True on success else False.
+        or not. Returns True on success else False. Test and increment
+        are a single statement, so concurrent calls can't exceed the
+        allowed number of workers.
         """
-        settings = self.get_settings()
-        if settings.running_workers < settings.max_workers:
-            self.increment_running_workers()
-            return True
-        return False
+        return self._execute(CMD_SETTINGS_TRY_INCREMENT_RUNNING_WORKERS) == 1
+
+
+_interfaces = {}
+_interfaces_lock = threading.Lock()
+
+
+def get_interface():
+    """
+    Returns the SQLiteInterface for the configured database. The
+    interface gets created on first access per process, so importing
+    the module does not open the database and a forked process does
+    not share the connection of its parent.
+    """
+    pid = os.getpid()
+    with _interfaces_lock:
+        instance = _interfaces.get(pid)
+        if instance is None:
+            # drop an interface inherited from the parent process:
+            _interfaces.clear()
+            instance = _interfaces[pid] = SQLiteInterface(
+                db_name=configuration.db_file
+            )
+            atexit.register(instance.close)
+            # on start delete cronjobs from the last run. They may have
+            # changed an will reread after deletion here.
+            instance.delete_cronjobs()
+        return instance
+
+
+class _LazyInterface:  # pylint: disable=too-few-public-methods
+    """
+    Stand-in for the module-level `interface`: forwards all attribute
+    access to the SQLiteInterface returned by `get_interface()`.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_interface(), name)
 
 
-interface = SQLiteInterface(db_name=configuration.db_file)
-# on start delete cronjobs from the last run. They may have changed
-# an will reread after deletion here.
-interface.delete_cronjobs()
+interface = _LazyInterface()
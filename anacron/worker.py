@@ -4,26 +4,64 @@ worker.py
 worker class for handling cron and delegated tasks.
 """
 
+import functools
 import importlib
 import os
+import pickle
+import select
 import signal
+import socket
 import sys
-import time
 
 from anacron.configuration import configuration
 from anacron.schedule import CronScheduler
-from anacron.sql_interface import interface
+from anacron.sql_interface import get_interface, PICKLE_PROTOCOL
 
 
-class Worker:
+@functools.lru_cache(maxsize=256)
+def _resolve(module_name, function_name):
+    """
+    Returns the function `function_name` from the module `module_name`.
+    The lookup is cached because the same functions get called again
+    and again.
+    """
+    module = importlib.import_module(module_name)
+    return getattr(module, function_name)
+
+
+def get_idle_time(idle_cycles):
+    """
+    Returns the time in seconds to keep idle after `idle_cycles`
+    consecutive cycles without tasks. The idle time doubles with every
+    cycle, starting with `worker_idle_time` up to `worker_max_idle_time`.
+    """
+    idle_time = configuration.worker_idle_time * 2 ** min(idle_cycles, 5)
+    return min(idle_time, configuration.worker_max_idle_time)
+
+
+class Worker:  # pylint: disable=too-many-instance-attributes
     """
     Runs in a separate process for task-handling.
     Gets supervised and monitored from the engine.
     """
-    def __init__(self):
+    def __init__(self, interface=None):
+        if interface is None:
+            interface = get_interface()
+        self.interface = interface  # allow dependency injection for tests
         self.active = True
         self.result = None
         self.error_message = None
+        # handled tasks to delete or to reschedule in the database
+        # and their results to store:
+        self.finished_rowids = []
+        self.next_schedules = []
+        self.results = []
+        # connected sockets (receiver, sender) to wake up the idle loop
+        # on terminate. Sockets and not a pipe, because on Windows
+        # select() works with sockets only:
+        self.wakeup_sockets = socket.socketpair()
+        for sock in self.wakeup_sockets:
+            sock.setblocking(False)
         signal.signal(signal.SIGINT, self.terminate)
         signal.signal(signal.SIGTERM, self.terminate)
         # prevent decorated function to register itself again
@@ -34,20 +72,43 @@ class Worker:
     def terminate(self, *args):  # pylint: disable=unused-argument
         """
         Signal handler to stop the process, terminates the loop in
-        `run()`.
+        `run()`. Wakes up an idle worker immediately.
         """
         self.active = False
+        try:
+            self.wakeup_sockets[1].send(b"\0")
+        except OSError:
+            # buffer is full: the worker gets woken up anyway,
+            # or the sockets are already closed.
+            pass
+
+    def close(self):
+        """
+        Closes the sockets to wake up the idle worker.
+        """
+        for sock in self.wakeup_sockets:
+            sock.close()
 
     def run(self):
         """
         Main event loop for the worker. Takes callables and processes
         them as long as callables are available. Otherwise keep idle.
         """
-        while self.active:
-            if not self.handle_tasks():
-                # nothing to do, check for results to delete:
-                interface.delete_outdated_results()
-                time.sleep(configuration.worker_idle_time)
+        idle_cycles = 0
+        try:
+            while self.active:
+                if self.handle_tasks():
+                    idle_cycles = 0
+                else:
+                    # nothing to do, check for results to delete:
+                    self.interface.delete_outdated_results()
+                    select.select(
+                        [self.wakeup_sockets[0]], [], [],
+                        get_idle_time(idle_cycles)
+                    )
+                    idle_cycles += 1
+        finally:
+            self.close()
 
     def handle_tasks(self):
         """
@@ -57,16 +118,22 @@ class Worker:
         method return `True` to indicate that meanwhile more tasks may be
         waiting.
         """
-        tasks = interface.get_tasks_on_due()
+        tasks = self.interface.get_tasks_on_due()
         if tasks:
-            for task in tasks:
-                if self.active is False:
-                    # terminate as soon as possible
-                    return True
-                self.error_message = None
-                self.result = None
-                self.process_task(task)
-                self.postprocess_task(task)
+            try:
+                for task in tasks:
+                    if self.active is False:
+                        # terminate as soon as possible
+                        return True
+                    self.error_message = None
+                    self.result = None
+                    self.process_task(task)
+                    self.postprocess_task(task)
+                    # write every task back on its own, so a failing
+                    # or killed worker does not repeat handled tasks:
+                    self.finalize_tasks()
+            finally:
+                self.finalize_tasks()
             return True
         return False
 
@@ -87,8 +154,7 @@ class Worker:
             }
 
         """
-        module = importlib.import_module(task.function_module)
-        function = getattr(module, task.function_name)
+        function = _resolve(task.function_module, task.function_name)
         try:
             self.result = function(*task.args, **task.kwargs)
         except Exception as err:  # pylint: disable=broad-exception-caught
@@ -96,25 +162,48 @@ class Worker:
 
     def postprocess_task(self, task):
         """
-        Delete or update the task and do something with the result or
-        error-message.
+        Register the result or error-message and the task for deletion
+        or for an update of the schedule. Results, deletions and updates
+        are written to the database by finalize_tasks().
         """
         if task.uuid:
-            # if the task has a uuid, store the result / error-message
-            interface.update_result(
-                uuid=task.uuid,
-                result=self.result,
-                error_message=self.error_message
+            # if the task has a uuid, store the result / error-message.
+            # Pickle the result here, so a result that can not get
+            # pickled is stored as error of this task:
+            try:
+                function_result = pickle.dumps(
+                    self.result, protocol=PICKLE_PROTOCOL
+                )
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                function_result = pickle.dumps(None, protocol=PICKLE_PROTOCOL)
+                self.error_message = repr(err)
+            self.results.append(
+                (task.uuid, function_result, self.error_message)
             )
         if task.crontab:
             # if the task has a crontab calculate new schedule
             # and update the task-entry
             scheduler = CronScheduler(crontab=task.crontab)
             schedule = scheduler.get_next_schedule()
-            interface.update_schedule(rowid=task.rowid, schedule=schedule)
+            self.next_schedules.append((schedule, task.rowid))
         else:
             # not a cronjob: delete the task from the db
-            interface.delete_callable(task)
+            self.finished_rowids.append(task.rowid)
+
+    def finalize_tasks(self):
+        """
+        Store the results and delete or reschedule the handled tasks in
+        the database in a single transaction.
+        """
+        if self.finished_rowids or self.next_schedules or self.results:
+            self.interface.finalize_tasks(
+                rowids=self.finished_rowids,
+                schedules=self.next_schedules,
+                results=self.results
+            )
+            self.finished_rowids = []
+            self.next_schedules = []
+            self.results = []
 
 
 def start_worker():
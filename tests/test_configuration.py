@@ -18,8 +18,7 @@ class TestConfiguration(unittest.TestCase):
         self.cd = self.configuration.__dict__.copy()
 
     def tearDown(self):
-        if self.configuration_file.exists():
-            self.configuration_file.unlink()
+        self.configuration_file.unlink(missing_ok=True)
 
     def test_no_configuration_file(self):
         """
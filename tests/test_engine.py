@@ -10,9 +10,11 @@ terminate the monitor-thread and the monitor thread should shut down the
 worker process.
 """
 
+import os
 import pathlib
+import signal
 import subprocess
-import time
+import tempfile
 import unittest
 
 from anacron import configuration
@@ -20,7 +22,13 @@ from anacron import engine
 from anacron import sql_interface
 
 
-TEST_DB_NAME = configuration.configuration.anacron_path / "test.db"
+# the engine needs a database file: prefer a memory-backed filesystem.
+SHM_DIR = pathlib.Path("/dev/shm")
+if os.access(SHM_DIR, os.W_OK):
+    TEST_DB_DIR = SHM_DIR
+else:
+    TEST_DB_DIR = pathlib.Path(tempfile.gettempdir())
+TEST_DB_NAME = TEST_DB_DIR / f"anacron_test_{os.getpid()}.db"
 
 
 class TestEngine(unittest.TestCase):
@@ -33,7 +41,8 @@ class TestEngine(unittest.TestCase):
 
     def tearDown(self):
         # clean up if tests don't run through
-        configuration.configuration.is_active = self._configuration_is_active
+        self.cc.is_active = self._configuration_is_active
+        self.interface.close()
         pathlib.Path(self.interface.db_name).unlink()
 
     def test_start_subprocess(self):
@@ -41,7 +50,8 @@ class TestEngine(unittest.TestCase):
         assert isinstance(process, subprocess.Popen) is True
         assert process.poll() is None
         process.terminate()
-        time.sleep(0.02)  # give process some time to terminate
+        # returns as soon as the process has terminated:
+        process.wait(timeout=1)
         assert process.poll() is not None
 
     def test_is_start_allowed(self):
@@ -56,4 +66,36 @@ class TestEngine(unittest.TestCase):
         self.engine.monitor_thread = None
         self.assertTrue(self.engine.is_start_allowed())
 
+    def test_start_and_stop(self):
+        # the monitor thread should terminate the worker process on
+        # stop and shut down without polling for the next tick.
+        self.cc.is_active = True
+        self.engine.start()
+        monitor_thread = self.engine.monitor_thread
+        assert monitor_thread.is_alive() is True
+        self.engine.stop()
+        monitor_thread.join(timeout=5)
+        assert monitor_thread.is_alive() is False
+        process = self.engine.worker_process
+        assert process is None or process.poll() is not None
 
+    def test_terminate_in_transaction(self):
+        # a signal interrupting a transaction stops the engine after the
+        # transaction has ended, so the decrement of the running
+        # workers gets committed:
+        signals = []
+        original_handler = signal.getsignal(signal.SIGTERM)
+        self.engine.original_handlers = {
+            signal.SIGTERM: lambda signum, frame: signals.append(signum)
+        }
+        self.engine.monitor_thread = "some reference"
+        self.interface.increment_running_workers()
+        try:
+            with self.interface.connection():
+                self.engine._terminate(signal.SIGTERM)
+                assert not signals
+            assert signals == [signal.SIGTERM]
+        finally:
+            signal.signal(signal.SIGTERM, original_handler)
+        self.interface.close()
+        assert self.interface.get_settings().running_workers == 0
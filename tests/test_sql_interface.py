@@ -5,10 +5,12 @@ testcode for sql-actions and for decorators
 """
 
 import collections
+import contextlib
 import datetime
-import pathlib
+import pickle
 import sqlite3
-import time
+import tempfile
+import threading
 import unittest
 import uuid
 
@@ -18,7 +20,9 @@ from anacron import sql_interface
 from anacron import worker
 
 
-TEST_DB_NAME = configuration.configuration.anacron_path / "test.db"
+# in-memory database: the interface keeps a single connection, so the
+# content persists during a test and nothing is left on the disk.
+TEST_DB_NAME = sql_interface.IN_MEMORY_DB_NAME
 
 
 def test_callable(*args, **kwargs):
@@ -30,20 +34,34 @@ def test_adder(a, b):
 def test_multiply(a, b):
     return a * b
 
+# signatures as stored in the task-table:
+CALLABLE_MODULE = test_callable.__module__
+CALLABLE_NAME = test_callable.__name__
+ADDER_NAME = test_adder.__name__
+
 
 class TestSQLInterface(unittest.TestCase):
 
     def setUp(self):
         self.interface = sql_interface.SQLiteInterface(db_name=TEST_DB_NAME)
-        self._result_ttl = configuration.configuration.result_ttl
+        self.cc = configuration.configuration
+        self._result_ttl = self.cc.result_ttl
+        self.now = datetime.datetime.now()
 
     def tearDown(self):
-        pathlib.Path(self.interface.db_name).unlink()
-        configuration.configuration.result_ttl = self._result_ttl
+        self.interface.close()
+        self.cc.result_ttl = self._result_ttl
+
+    def _schedules(self, number):
+        """
+        Returns `number` distinct schedules in the past, as the schedule
+        is the primary key of the task-table.
+        """
+        return [self.now - datetime.timedelta(seconds=n) for n in range(number)]
 
     def test_storage(self):
         entries = self.interface.get_tasks_on_due()
-        self.assertFalse(list(entries))
+        self.assertFalse(entries)
         self.interface.register_callable(test_callable)
         entries = self.interface.get_tasks_on_due()
         assert len(entries) == 1
@@ -53,8 +71,8 @@ class TestSQLInterface(unittest.TestCase):
         entries = self.interface.get_tasks_on_due()
         obj = entries[0]
         assert isinstance(obj, sql_interface.HybridNamespace) is True
-        assert obj["function_module"] == test_callable.__module__
-        assert obj["function_name"] == test_callable.__name__
+        assert obj["function_module"] == CALLABLE_MODULE
+        assert obj["function_name"] == CALLABLE_NAME
 
     def test_arguments(self):
         args = ["pi", 3.141]
@@ -63,7 +81,7 @@ class TestSQLInterface(unittest.TestCase):
         self.interface.register_callable(
             test_callable, crontab=crontab, args=args, kwargs=kwargs
         )
-        entries = list(self.interface.get_tasks_on_due())
+        entries = self.interface.get_tasks_on_due()
         obj = entries[0]
         assert obj["crontab"] == crontab
         assert obj["args"] == args
@@ -71,55 +89,75 @@ class TestSQLInterface(unittest.TestCase):
 
     def test_get_tasks(self):
         # test the generic function to select all tasks:
-        schedule = datetime.datetime.now() + datetime.timedelta(seconds=10)
-        self.interface.register_callable(test_adder, schedule=schedule)
-        self.interface.register_callable(test_callable)
-        self.interface.register_callable(test_multiply, crontab="* * * * *")
+        schedule = self.now + datetime.timedelta(seconds=10)
+        past_schedule = self.now - datetime.timedelta(seconds=1)
+        self.interface.register_callables([
+            (test_adder, {"schedule": schedule}),
+            (test_callable, {}),
+            (test_multiply, {"schedule": past_schedule, "crontab": "* * * * *"}),
+        ])
         # should return everything:
         entries = self.interface.get_tasks()
         assert len(entries) == 3
 
+    def test_register_callables(self):
+        # register multiple callables in a single transaction:
+        schedule = self.now + datetime.timedelta(seconds=10)
+        past_schedule = self.now - datetime.timedelta(seconds=1)
+        self.interface.register_callables([
+            (test_adder, {"schedule": schedule, "args": (40, 2)}),
+            (test_callable, {}),
+            (test_multiply, {"schedule": past_schedule, "crontab": "* * * * *"}),
+        ])
+        assert self.interface.count_tasks() == 3
+        entry = self.interface.get_tasks_by_signature(test_adder)[0]
+        assert entry.schedule == schedule
+        assert entry.args == (40, 2)
+
     def test_schedules_get_one_of_two(self):
         # register two callables, one with a schedule in the future
-        schedule = datetime.datetime.now() + datetime.timedelta(seconds=10)
-        self.interface.register_callable(test_adder, schedule=schedule)
-        self.interface.register_callable(test_callable)
-        # test to get one callable at due
-        entries = self.interface.get_tasks_on_due()
-        assert len(entries) == 1
+        schedule = self.now + datetime.timedelta(seconds=10)
+        self.interface.register_callables(
+            [(test_adder, {"schedule": schedule}), (test_callable, {})]
+        )
+        # test for the number of callables at due
+        assert self.interface.count_tasks_on_due() == 1
 
     def test_schedules_get_two_of_two(self):
         # register two callables, both scheduled in the present or past
-        schedule = datetime.datetime.now() - datetime.timedelta(seconds=10)
-        self.interface.register_callable(test_adder, schedule=schedule)
-        self.interface.register_callable(test_callable)
-        # test to get one callable at due
-        entries = self.interface.get_tasks_on_due()
-        assert len(entries) == 2
+        schedule = self.now - datetime.timedelta(seconds=10)
+        self.interface.register_callables(
+            [(test_adder, {"schedule": schedule}), (test_callable, {})]
+        )
+        # test for the number of callables at due
+        assert self.interface.count_tasks_on_due() == 2
 
     def test_delete(self):
         # register two callables, one with a schedule in the future
-        schedule = datetime.datetime.now() + datetime.timedelta(milliseconds=1)
-        self.interface.register_callable(test_adder, schedule=schedule)
-        self.interface.register_callable(test_callable)
+        schedule = self.now + datetime.timedelta(hours=1)
+        self.interface.register_callables(
+            [(test_adder, {"schedule": schedule}), (test_callable, {})]
+        )
         # test to get the `test_callable` function on due
         # and delete it from the db
-        entry = self.interface.get_tasks_on_due()[0]
-        assert entry["function_name"] == test_callable.__name__
+        entries = self.interface.get_tasks_on_due()
+        assert len(entries) == 1
+        entry = entries[0]
+        assert entry["function_name"] == CALLABLE_NAME
         self.interface.delete_callable(entry)
-        # wait and test to get the remaining single entry
+        # test to get the remaining single entry once it is on due
         # and check whether it is the `test_adder` function
-        time.sleep(0.001)
-        entries = self.interface.get_tasks_on_due()
+        entries = self.interface.get_tasks_on_due(schedule=schedule)
         assert len(entries) == 1
         entry = entries[0]
-        assert entry["function_name"] == test_adder.__name__
+        assert entry["function_name"] == ADDER_NAME
 
     def test_get_task_by_signature(self):
         # register two callables, one with a schedule in the future
-        schedule = datetime.datetime.now() + datetime.timedelta(seconds=10)
-        self.interface.register_callable(test_adder, schedule=schedule)
-        self.interface.register_callable(test_callable)
+        schedule = self.now + datetime.timedelta(seconds=10)
+        self.interface.register_callables(
+            [(test_adder, {"schedule": schedule}), (test_callable, {})]
+        )
         # find a nonexistent callable should return an empty generator
         entries = self.interface.get_tasks_by_signature(test_multiply)
         assert len(entries) == 0
@@ -131,16 +169,17 @@ class TestSQLInterface(unittest.TestCase):
         # it is allowed to register the same callables multiple times.
         # regardless of the schedule `get_tasks_by_signature()` should return
         # all entries.
-        schedule = datetime.datetime.now() + datetime.timedelta(seconds=10)
-        self.interface.register_callable(test_adder, schedule=schedule)
-        self.interface.register_callable(test_adder)
-        entries = list(self.interface.get_tasks_by_signature(test_adder))
+        schedule = self.now + datetime.timedelta(seconds=10)
+        self.interface.register_callables(
+            [(test_adder, {"schedule": schedule}), (test_adder, {})]
+        )
+        entries = self.interface.get_tasks_by_signature(test_adder)
         assert len(entries) == 2
 
     def test_update_schedule(self):
         # entries like cronjobs should not get deleted from the tasks
         # but updated with the next schedule
-        schedule = datetime.datetime.now()
+        schedule = self.now
         next_schedule = schedule + datetime.timedelta(seconds=10)
         self.interface.register_callable(test_adder, schedule=schedule)
         entry = self.interface.get_tasks_by_signature(test_adder)[0]
@@ -162,6 +201,30 @@ class TestSQLInterface(unittest.TestCase):
         # return a TaskResult instance:
         assert result is not None
         assert result.is_waiting is True
+        # no result stored jet:
+        assert result.result is None
+
+    def test_register_results(self):
+        uuids = [uuid.uuid4().hex for _ in range(3)]
+        self.interface.register_results(
+            (test_adder, {"uuid": uuid_}) for uuid_ in uuids
+        )
+        assert self.interface.count_results() == 3
+        for uuid_ in uuids:
+            assert self.interface.get_result_by_uuid(uuid_).is_waiting is True
+
+    def test_register_delayed_callable(self):
+        uuid_ = uuid.uuid4().hex
+        self.interface.register_delayed_callable(
+            test_adder, uuid_, args=(40,), kwargs={"b": 2}
+        )
+        task = self.interface.get_tasks()[0]
+        assert task.uuid == uuid_
+        assert task.args == (40,)
+        assert task.kwargs == {"b": 2}
+        result = self.interface.get_result_by_uuid(uuid_)
+        assert result.is_waiting is True
+        assert result.function_arguments == ((40,), {"b": 2})
 
     def test_update_result_no_error(self):
         answer = 42
@@ -183,7 +246,7 @@ class TestSQLInterface(unittest.TestCase):
         assert result.has_error is True
 
     def test_do_not_delete_waiting_results(self):
-        configuration.configuration.result_ttl = datetime.timedelta()
+        self.cc.result_ttl = datetime.timedelta()
         self.interface.register_result(test_callable, uuid.uuid4().hex)
         self.interface.register_result(test_adder, uuid.uuid4().hex)
         entries = self.interface.count_results()
@@ -197,7 +260,7 @@ class TestSQLInterface(unittest.TestCase):
             uuid_,
             status=sql_interface.TASK_STATUS_READY
         )
-        configuration.configuration.result_ttl = datetime.timedelta()
+        self.cc.result_ttl = datetime.timedelta()
         # this result is outdated
         self.interface.register_result(
             test_adder,
@@ -211,8 +274,8 @@ class TestSQLInterface(unittest.TestCase):
         assert entries == 1
         # the remaining entry should be the `test_callable` result
         entry = self.interface.get_result_by_uuid(uuid_)
-        assert entry.function_module == test_callable.__module__
-        assert entry.function_name == test_callable.__name__
+        assert entry.function_module == CALLABLE_MODULE
+        assert entry.function_name == CALLABLE_NAME
 
     def test_delete_mixed_results(self):
         # register a waiting result, a regular result, an outdated result
@@ -228,7 +291,7 @@ class TestSQLInterface(unittest.TestCase):
             status=sql_interface.TASK_STATUS_READY
         )
         # set ttl to 0:
-        configuration.configuration.result_ttl = datetime.timedelta()
+        self.cc.result_ttl = datetime.timedelta()
         # the outdated result:
         self.interface.register_result(
             test_callable,
@@ -273,6 +336,94 @@ class TestSQLInterface(unittest.TestCase):
         entries = self.interface.count_results()
         assert entries == 3
 
+    def test_get_tasks_on_due_limit(self):
+        # tasks on due are returned ordered by schedule and limited
+        for seconds in (3, 1, 2):
+            schedule = self.now - datetime.timedelta(seconds=seconds)
+            self.interface.register_callable(test_callable, schedule=schedule)
+        entries = self.interface.get_tasks_on_due(limit=2)
+        assert len(entries) == 2
+        assert entries[0].schedule == self.now - datetime.timedelta(seconds=3)
+        assert entries[1].schedule == self.now - datetime.timedelta(seconds=2)
+        entries = self.interface.get_tasks_on_due(limit=-1)
+        assert len(entries) == 3
+
+    def test_delete_callables(self):
+        self.interface.register_callables(
+            [(func, {"schedule": schedule}) for func, schedule in zip(
+                (test_callable, test_adder, test_multiply), self._schedules(3)
+            )]
+        )
+        entries = self.interface.get_tasks()
+        self.interface.delete_callables(entries[:2])
+        entries = self.interface.get_tasks()
+        assert len(entries) == 1
+
+    def test_delete_callables_in_chunks(self):
+        chunk_size = sql_interface.DELETE_TASKS_CHUNK_SIZE
+        sql_interface.DELETE_TASKS_CHUNK_SIZE = 2
+        self.addCleanup(
+            setattr, sql_interface, "DELETE_TASKS_CHUNK_SIZE", chunk_size
+        )
+        self.interface.register_callables(
+            [(func, {"schedule": schedule}) for func, schedule in zip(
+                (test_callable, test_adder, test_multiply), self._schedules(3)
+            )]
+        )
+        self.interface.delete_callables(self.interface.get_tasks())
+        assert self.interface.count_tasks() == 0
+
+    def test_finalize_tasks(self):
+        # delete a task and update the schedule of a cronjob
+        # in a single call:
+        # and store the result of the task:
+        uuid_ = uuid.uuid4().hex
+        self.interface.register_callable(test_callable, uuid=uuid_)
+        self.interface.register_result(test_callable, uuid=uuid_)
+        self.interface.register_callable(test_adder, crontab="* * * * *")
+        task, cronjob = self.interface.get_tasks_on_due()
+        next_schedule = self.now + datetime.timedelta(seconds=10)
+        self.interface.finalize_tasks(
+            rowids=[task.rowid],
+            schedules=[(next_schedule, cronjob.rowid)],
+            results=[(uuid_, pickle.dumps(42), None)]
+        )
+        entries = self.interface.get_tasks()
+        assert len(entries) == 1
+        assert entries[0].function_name == ADDER_NAME
+        assert entries[0].schedule == next_schedule
+        result = self.interface.get_result_by_uuid(uuid_)
+        assert result.is_ready is True
+        assert result.result == 42
+
+    def _query_plan(self, cmd, parameters):
+        rows = self.interface._fetchall(f"EXPLAIN QUERY PLAN {cmd}", parameters)
+        return " ".join(row[-1] for row in rows)
+
+    def test_tasks_on_due_query_plan(self):
+        # the schedule is the primary key: selecting the tasks on due
+        # searches the index of the primary key instead of a table scan.
+        plan = self._query_plan(
+            sql_interface.CMD_GET_TASKS_ON_DUE,
+            [sql_interface.datetime_adapter(self.now), -1]
+        )
+        assert "USING INDEX sqlite_autoindex_task_1" in plan
+
+    def test_outdated_results_query_plan(self):
+        plan = self._query_plan(
+            sql_interface.CMD_DELETE_OUTDATED_RESULTS,
+            [sql_interface.datetime_adapter(self.now)]
+        )
+        assert "USING INDEX idx_result_status_ttl" in plan
+
+    def test_count_tasks_on_due(self):
+        schedule = self.now + datetime.timedelta(hours=1)
+        self.interface.register_callables(
+            [(test_adder, {"schedule": schedule}), (test_callable, {})]
+        )
+        assert self.interface.count_tasks_on_due() == 1
+        assert self.interface.count_tasks_on_due(schedule=schedule) == 2
+
     def test_count_tasks(self):
         # register three callables, two as cronjobs.
         # check whether there are three entries in the database
@@ -294,8 +445,23 @@ class TestSQLInterface(unittest.TestCase):
         assert entries == 1
         # remaining entry should be the test_callable
         entry = self.interface.get_tasks_on_due()[0]
-        assert entry.function_module == test_callable.__module__
-        assert entry.function_name == test_callable.__name__
+        assert entry.function_module == CALLABLE_MODULE
+        assert entry.function_name == CALLABLE_NAME
+
+    def test_delete_cronjobs_by_signature(self):
+        # register a task and two cronjobs of the same callable and a
+        # cronjob of another callable. Deleting the cronjobs by
+        # signature should just delete the two cronjobs of the callable.
+        self.interface.register_callable(test_adder)
+        self.interface.register_callable(test_adder, crontab="* * * * *")
+        self.interface.register_callable(test_adder, crontab="1 * * * *")
+        self.interface.register_callable(test_multiply, crontab="* * * * *")
+        self.interface.delete_cronjobs_by_signature(test_adder)
+        entries = self.interface.get_tasks_by_signature(test_adder)
+        assert len(entries) == 1
+        assert entries[0].crontab == ""
+        entries = self.interface.get_tasks_by_signature(test_multiply)
+        assert len(entries) == 1
 
     def test_initialize_settings_table(self):
         """
@@ -364,6 +530,141 @@ class TestSQLInterface(unittest.TestCase):
         self.assertFalse(self.interface.try_increment_running_workers())
 
 
+    def test_persistent_connection(self):
+        # all commands run on the same connection, so an in-memory
+        # database keeps its content between the calls:
+        interface = sql_interface.SQLiteInterface(db_name=":memory:")
+        interface.register_callable(test_callable)
+        assert interface.count_tasks() == 1
+        interface.close()
+
+    def test_get_interface(self):
+        # the module-level interface gets created on first access
+        # once per process:
+        instance = sql_interface.get_interface()
+        assert isinstance(instance, sql_interface.SQLiteInterface)
+        assert sql_interface.get_interface() is instance
+        assert sql_interface.interface.db_name == instance.db_name
+
+    def test_connection_pragmas(self):
+        con = self.interface._get_connection()
+        (cache_size,) = con.execute("PRAGMA cache_size").fetchone()
+        assert cache_size == -65536
+        (temp_store,) = con.execute("PRAGMA temp_store").fetchone()
+        assert temp_store == 2  # MEMORY
+
+    def test_file_connection_pragmas(self):
+        # WAL is not available for in-memory databases, test with a file:
+        with tempfile.TemporaryDirectory() as directory:
+            interface = sql_interface.SQLiteInterface(
+                db_name=f"{directory}/test.db"
+            )
+            con = interface._get_connection()
+            (journal_mode,) = con.execute("PRAGMA journal_mode").fetchone()
+            assert journal_mode == "wal"
+            (synchronous,) = con.execute("PRAGMA synchronous").fetchone()
+            assert synchronous == 1  # NORMAL
+            (mmap_size,) = con.execute("PRAGMA mmap_size").fetchone()
+            assert mmap_size == 268435456
+            interface.close()
+
+    def test_convert_text_datetimes(self):
+        # former versions have stored the schedules as ISO-text:
+        with tempfile.TemporaryDirectory() as directory:
+            db_name = f"{directory}/test.db"
+            interface = sql_interface.SQLiteInterface(db_name=db_name)
+            interface.register_callable(test_callable, schedule=self.now)
+            con = interface._get_connection()
+            with con:
+                con.execute(
+                    "UPDATE task SET schedule = ?", (self.now.isoformat(),)
+                )
+            interface.close()
+            interface = sql_interface.SQLiteInterface(db_name=db_name)
+            entries = interface.get_tasks_on_due()
+            interface.close()
+        assert len(entries) == 1
+        assert entries[0]["schedule"] == self.now
+
+    def test_datetime_adapter_aware(self):
+        # timezone aware datetimes are stored as naive local time:
+        aware = self.now.astimezone(datetime.timezone.utc)
+        value = sql_interface.datetime_adapter(aware)
+        assert value == sql_interface.datetime_adapter(self.now)
+        assert sql_interface.datetime_converter(value) == self.now
+
+    def test_convert_aware_text_datetimes(self):
+        # former versions have stored aware datetimes with utc-offset:
+        aware = self.now.astimezone(datetime.timezone.utc)
+        with tempfile.TemporaryDirectory() as directory:
+            db_name = f"{directory}/test.db"
+            interface = sql_interface.SQLiteInterface(db_name=db_name)
+            interface.register_callable(test_callable, schedule=self.now)
+            con = interface._get_connection()
+            with con:
+                con.execute(
+                    "UPDATE task SET schedule = ?", (aware.isoformat(),)
+                )
+            interface.close()
+            interface = sql_interface.SQLiteInterface(db_name=db_name)
+            entries = interface.get_tasks()
+            interface.close()
+        assert entries[0]["schedule"] == self.now
+
+    def test_connection_rollback_on_error(self):
+        # commands inside the connection-context run in a single
+        # transaction: nothing gets stored in case of an error.
+        with self.assertRaises(ValueError):
+            with self.interface.connection():
+                self.interface.register_callable(test_callable)
+                self.interface.register_callable(test_adder)
+                raise ValueError()
+        assert self.interface.count_tasks() == 0
+        with self.interface.connection():
+            self.interface.register_callable(test_callable)
+            self.interface.register_callable(test_adder)
+        assert self.interface.count_tasks() == 2
+
+    def test_run_after_transaction(self):
+        calls = []
+        self.interface.run_after_transaction(lambda: calls.append(1))
+        assert calls == [1]
+        with self.interface.connection():
+            self.interface.run_after_transaction(lambda: calls.append(2))
+            assert calls == [1]
+        assert calls == [1, 2]
+
+    def test_read_while_other_thread_rolls_back(self):
+        # rows are fetched while holding the lock: a rollback in another
+        # thread must not reset the cursor of a reading thread.
+        self.interface.register_callables(
+            [(test_callable, {"schedule": schedule})
+             for schedule in self._schedules(50)]
+        )
+        errors = []
+
+        def read():
+            try:
+                for _ in range(50):
+                    assert len(self.interface.get_tasks()) == 50
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                errors.append(err)
+
+        def rollback():
+            for _ in range(50):
+                with contextlib.suppress(ValueError):
+                    with self.interface.connection():
+                        self.interface.register_callable(test_adder)
+                        raise ValueError()
+
+        threads = [threading.Thread(target=read) for _ in range(3)]
+        threads.append(threading.Thread(target=rollback))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+
 
 # decorator testing includes database access.
 # for easier testing decorator tests are included here.
@@ -379,7 +680,7 @@ class TestCronDecorator(unittest.TestCase):
         decorators.interface = sql_interface.SQLiteInterface(db_name=TEST_DB_NAME)
 
     def tearDown(self):
-        pathlib.Path(decorators.interface.db_name).unlink()
+        decorators.interface.close()
         decorators.interface = self.orig_interface
 
 #     def test_cron_no_arguments_inactive(self):
@@ -398,7 +699,7 @@ class TestCronDecorator(unittest.TestCase):
         wrapper = decorators.cron()
         func = wrapper(cron_function)
         assert func == cron_function
-        entries = list(decorators.interface.get_tasks_by_signature(cron_function))
+        entries = decorators.interface.get_tasks_by_signature(cron_function)
         assert len(entries) == 1
         entry = entries[0]
         assert entry["crontab"] == decorators.DEFAULT_CRONTAB
@@ -410,41 +711,49 @@ class TestCronDecorator(unittest.TestCase):
         # the db then should hold just a single entry deleting
         # the other ones.
         # should not happen:
-        decorators.interface.register_callable(cron_function, crontab=decorators.DEFAULT_CRONTAB)
-        decorators.interface.register_callable(cron_function, crontab=decorators.DEFAULT_CRONTAB)
-        entries = list(decorators.interface.get_tasks_by_signature(cron_function))
+        now = datetime.datetime.now()
+        decorators.interface.register_callables([
+            (cron_function, {
+                "schedule": now - datetime.timedelta(seconds=seconds),
+                "crontab": decorators.DEFAULT_CRONTAB,
+            }) for seconds in (1, 2)
+        ])
+        entries = decorators.interface.get_tasks_by_signature(cron_function)
         assert len(entries) == 2
         # now add the same function with the cron decorator:
         crontab = "10 2 1 * *"
-        configuration.configuration.is_active = True
+        cfg = configuration.configuration
+        # restore the state also in case the test fails:
+        self.addCleanup(setattr, cfg, "is_active", cfg.is_active)
+        cfg.is_active = True
         wrapper = decorators.cron(crontab=crontab)
         func = wrapper(cron_function)
         # just a single entry should no be in the database
         # (the one added by the decorator):
-        entries = list(decorators.interface.get_tasks_by_signature(cron_function))
+        entries = decorators.interface.get_tasks_by_signature(cron_function)
         assert len(entries) == 1
         entry = entries[0]
         assert entry["crontab"] == crontab
-        configuration.configuration.is_active = False
 
 
 def delay_function():
     return 42
 
+def unpicklable_function():
+    return lambda: 42
+
 
 class TestDelayDecorator(unittest.TestCase):
 
     def setUp(self):
         self.orig_decorator_interface = decorators.interface
-        self.orig_worker_interface = worker.interface
-        worker.interface = decorators.interface =\
+        decorators.interface =\
             sql_interface.SQLiteInterface(db_name=TEST_DB_NAME)
         self._deactivate()
 
     def tearDown(self):
-        pathlib.Path(decorators.interface.db_name).unlink()
+        decorators.interface.close()
         decorators.interface = self.orig_decorator_interface
-        worker.interface = self.orig_worker_interface
         self._deactivate()
 
     @staticmethod
@@ -493,7 +802,6 @@ class TestDelayDecorator(unittest.TestCase):
         assert uuid_ is not None
 
         # 2: a single entry is now in both tables:
-        time.sleep(0.001)  # have some patience with the db.
         task_entries = decorators.interface.get_tasks_by_signature(test_adder)
         assert len(task_entries) == 1
         result = decorators.interface.get_result_by_uuid(uuid_)
@@ -506,11 +814,11 @@ class TestDelayDecorator(unittest.TestCase):
         # worker assumes to run in a separate process.
         # This is important as otherwise calling the task will not execute
         # the task but registering the task again by the wrapper.
-        worker_ = worker.Worker()
+        worker_ = worker.Worker(interface=decorators.interface)
         # return True if at least one task has handled:
         return_value = worker_.handle_tasks()
+        worker_.close()
         assert return_value is True
-        time.sleep(0.001)  # have some patience with the db.
         # after handling the task should be removed from the db:
         task_entries = decorators.interface.get_tasks_by_signature(test_adder)
         assert len(task_entries) == 0
@@ -520,6 +828,22 @@ class TestDelayDecorator(unittest.TestCase):
         assert result.is_ready is True
         assert result.result == 42  # 40 + 2
 
+    def test_unpicklable_result(self):
+        # a result that can not get pickled is stored as error of this
+        # task and does not affect the other tasks:
+        self._activate()
+        uuid_ = decorators.delay(test_adder)(40, 2)
+        bad_uuid = decorators.delay(unpicklable_function)()
+        worker_ = worker.Worker(interface=decorators.interface)
+        worker_.handle_tasks()
+        worker_.close()
+        assert decorators.interface.count_tasks() == 0
+        result = decorators.interface.get_result_by_uuid(uuid_)
+        assert result.result == 42
+        result = decorators.interface.get_result_by_uuid(bad_uuid)
+        assert result.has_error is True
+        assert result.result is None
+
 
 class TestHybridNamespace(unittest.TestCase):
 
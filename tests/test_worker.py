@@ -6,7 +6,6 @@ tests for the engine and the worker.
 import pathlib
 import subprocess
 import sys
-import time
 import unittest
 
 from anacron import configuration
@@ -28,5 +27,18 @@ class TestWorkerStartStop(unittest.TestCase):
         process = subprocess.Popen(self.cmd, cwd=self.cwd)
         assert process.poll() is None  # subprocess runs
         process.terminate()
-        time.sleep(0.1)
+        # returns as soon as the process has terminated:
+        process.wait(timeout=1)
         assert process.poll() is not None
+
+
+class TestWorkerIdleTime(unittest.TestCase):
+
+    def test_idle_time_backoff(self):
+        cfg = configuration.configuration
+        idle_time = cfg.worker_idle_time
+        assert worker.get_idle_time(0) == idle_time
+        assert worker.get_idle_time(1) == min(
+            idle_time * 2, cfg.worker_max_idle_time
+        )
+        assert worker.get_idle_time(100) == cfg.worker_max_idle_time